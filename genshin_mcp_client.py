@@ -6,10 +6,11 @@ This script demonstrates how to interact with the MCP server.
 
 import asyncio
 import json
-from mcp.client import Client
 from mcp.client.session import ClientSession
 from mcp.client.stdio import StdioServerParameters, stdio_client
 
+from genshin_mcp_loop import run_event_loop
+
 async def test_genshin_mcp_server():
     """Test the Genshin Impact MCP server functionality"""
     
@@ -24,49 +25,53 @@ async def test_genshin_mcp_server():
             # Initialize the client
             await session.initialize()
             
+            # Issue every request up front so they pipeline over stdio
+            resources, tools, char_info, builds, teams, guide, chars_data = await asyncio.gather(
+                session.list_resources(),
+                session.list_tools(),
+                session.call_tool("get_character_info", {"character_name": "mavuika"}),
+                session.call_tool("get_character_builds", {"character_name": "mavuika"}),
+                session.call_tool("get_team_compositions", {"character_name": "mavuika"}),
+                session.call_tool("create_build_guide", {
+                    "character_name": "mavuika",
+                    "include_teams": True
+                }),
+                session.read_resource("genshin://characters")
+            )
+            
             print("🎮 Genshin Impact MCP Server Test")
             print("=" * 50)
             
             # Test 1: List available resources
             print("\n📋 Available Resources:")
-            resources = await session.list_resources()
-            for resource in resources:
+            for resource in resources.resources:
                 print(f"  - {resource.name}: {resource.description}")
             
             # Test 2: List available tools
             print("\n🔧 Available Tools:")
-            tools = await session.list_tools()
-            for tool in tools:
+            for tool in tools.tools:
                 print(f"  - {tool.name}: {tool.description}")
             
             # Test 3: Get character info
             print("\n👤 Character Information:")
-            char_info = await session.call_tool("get_character_info", {"character_name": "mavuika"})
-            print(char_info[0].text)
+            print(char_info.content[0].text)
             
             # Test 4: Get character builds
             print("\n⚔️ Character Builds:")
-            builds = await session.call_tool("get_character_builds", {"character_name": "mavuika"})
-            print(builds[0].text)
+            print(builds.content[0].text)
             
             # Test 5: Get team compositions
             print("\n👥 Team Compositions:")
-            teams = await session.call_tool("get_team_compositions", {"character_name": "mavuika"})
-            print(teams[0].text)
+            print(teams.content[0].text)
             
             # Test 6: Create complete build guide
             print("\n📖 Complete Build Guide:")
-            guide = await session.call_tool("create_build_guide", {
-                "character_name": "mavuika",
-                "include_teams": True
-            })
-            print(guide[0].text)
+            print(guide.content[0].text)
             
             # Test 7: Read characters resource
             print("\n📚 Characters Database:")
-            chars_data = await session.read_resource("genshin://characters")
-            chars = json.loads(chars_data)
+            chars = json.loads(chars_data.contents[0].text)
             print(f"Available characters: {', '.join(chars.keys())}")
 
 if __name__ == "__main__":
-    asyncio.run(test_genshin_mcp_server())
+    run_event_loop(test_genshin_mcp_server())
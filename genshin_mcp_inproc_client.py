@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+In-process check script for Genshin Impact MCP Server
+Runs the server in the same process over an in-memory transport, so no
+subprocess is spawned. Use genshin_mcp_client.py for end-to-end stdio testing.
+"""
+
+import asyncio
+import json
+import sys
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from genshin_mcp_loop import run_event_loop
+from genshin_mcp_server import GenshinMCPServer
+
+async def check_genshin_mcp_server_inproc() -> list[str]:
+    """Exercise the Genshin Impact MCP server handlers and return any failures"""
+
+    server = GenshinMCPServer()
+    failures = []
+
+    def check(condition: bool, message: str):
+        if not condition:
+            failures.append(message)
+
+    async with create_connected_server_and_client_session(server.server) as session:
+        resources, tools, char_info, builds, teams, guide, chars_data = await asyncio.gather(
+            session.list_resources(),
+            session.list_tools(),
+            session.call_tool("get_character_info", {"character_name": "mavuika"}),
+            session.call_tool("get_character_builds", {"character_name": "mavuika"}),
+            session.call_tool("get_team_compositions", {"character_name": "mavuika"}),
+            session.call_tool("create_build_guide", {
+                "character_name": "mavuika",
+                "include_teams": True
+            }),
+            session.read_resource("genshin://characters")
+        )
+
+        # Resource URIs come back as pydantic AnyUrl, which never equals a str
+        check(
+            {str(r.uri) for r in resources.resources} >= {"genshin://characters", "genshin://builds", "genshin://teams"},
+            "resources/list is missing a genshin:// resource"
+        )
+        check(
+            {t.name for t in tools.tools} == {
+                "get_character_info",
+                "get_character_builds",
+                "get_team_compositions",
+                "create_build_guide"
+            },
+            "tools/list does not match the expected tool set"
+        )
+        check("**Mavuika**" in char_info.content[0].text, "get_character_info output is wrong")
+        check("**Build Guide for Mavuika**" in builds.content[0].text, "get_character_builds output is wrong")
+        check("**Team Compositions for Mavuika**" in teams.content[0].text, "get_team_compositions output is wrong")
+        check("## Team Compositions" in guide.content[0].text, "create_build_guide output is missing teams")
+
+        chars = json.loads(chars_data.contents[0].text)
+        check("mavuika" in chars, "genshin://characters is missing mavuika")
+
+    return failures
+
+if __name__ == "__main__":
+    failures = run_event_loop(check_genshin_mcp_server_inproc())
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ In-process checks passed")
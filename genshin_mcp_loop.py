@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Event loop helper shared by the Genshin Impact MCP server and test clients.
+"""
+
+import asyncio
+from typing import Any, Coroutine
+
+def run_event_loop(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run coro on uvloop when it is installed, else on the default asyncio loop"""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    # uvloop.run() only exists in uvloop 0.18+
+    if not hasattr(uvloop, "run"):
+        return asyncio.run(coro)
+    return uvloop.run(coro)
@@ -4,23 +4,36 @@ Genshin Impact MCP Server Demo
 A Model Context Protocol server that provides character information and build guides for Genshin Impact.
 """
 
-import asyncio
+import functools
 import json
 import logging
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
-from mcp.server import Server
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
+from dataclasses import asdict, dataclass, field
+from mcp.server import NotificationOptions, Server
 from mcp.server.models import InitializationOptions
 import mcp.server.stdio
 import mcp.types as types
-import httpx
-import re
+from pydantic import AnyUrl
+
+from genshin_mcp_loop import run_event_loop
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("genshin-mcp-server")
 
-@dataclass
+def _dumps(obj: Any) -> str:
+    """Serialize obj as indented JSON, using orjson when it is available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+@dataclass(slots=True, frozen=True)
 class Character:
     name: str
     element: str
@@ -28,356 +41,439 @@ class Character:
     rarity: int
     role: str
     description: str
+    
+    @property
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-ready view used by the genshin://characters resource"""
+        return asdict(self)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Build:
     character: str
     role: str
     main_stats: Dict[str, str]
-    artifact_sets: List[str]
-    weapons: List[str]
-    substats_priority: List[str]
-    talent_priority: List[str]
+    artifact_sets: Tuple[str, ...]
+    weapons: Tuple[str, ...]
+    substats_priority: Tuple[str, ...]
+    talent_priority: Tuple[str, ...]
+    # Display strings, joined once in __post_init__
+    artifact_sets_str: str = field(init=False, repr=False, compare=False)
+    weapons_str: str = field(init=False, repr=False, compare=False)
+    substats_str: str = field(init=False, repr=False, compare=False)
+    talent_str: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, "artifact_sets_str", ", ".join(self.artifact_sets))
+        object.__setattr__(self, "weapons_str", ", ".join(self.weapons))
+        object.__setattr__(self, "substats_str", " > ".join(self.substats_priority))
+        object.__setattr__(self, "talent_str", " > ".join(self.talent_priority))
+    
+    @property
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-ready view used by the genshin://builds resource"""
+        # The owning character is already the key in the builds mapping, and
+        # the display strings are derived from the other fields
+        data = asdict(self)
+        for key in ("character", "artifact_sets_str", "weapons_str", "substats_str", "talent_str"):
+            del data[key]
+        return data
+
+_CHARACTERS: Mapping[str, Character] = MappingProxyType({
+    "mavuika": Character(
+        name="Mavuika",
+        element="Pyro",
+        weapon_type="Claymore",
+        rarity=5,
+        role="DPS/Support",
+        description="The Pyro Archon with powerful elemental abilities"
+    ),
+    "neuvillette": Character(
+        name="Neuvillette",
+        element="Hydro",
+        weapon_type="Catalyst",
+        rarity=5,
+        role="DPS",
+        description="Hydro DPS with charge attack focus"
+    ),
+    "kazuha": Character(
+        name="Kazuha",
+        element="Anemo",
+        weapon_type="Sword",
+        rarity=5,
+        role="Support",
+        description="Anemo support with crowd control and elemental damage bonus"
+    ),
+    "nahida": Character(
+        name="Nahida",
+        element="Dendro",
+        weapon_type="Catalyst",
+        rarity=5,
+        role="Support/DPS",
+        description="Dendro Archon with reaction-based abilities"
+    ),
+    "furina": Character(
+        name="Furina",
+        element="Hydro",
+        weapon_type="Sword",
+        rarity=5,
+        role="Support",
+        description="Hydro support with summoning abilities"
+    )
+})
+
+_BUILDS: Mapping[str, Tuple[Build, ...]] = MappingProxyType({
+    "mavuika": (
+        Build(
+            character="Mavuika",
+            role="DPS",
+            main_stats={"sands": "ATK%", "goblet": "Pyro DMG%", "circlet": "CRIT Rate/DMG"},
+            artifact_sets=("Crimson Witch of Flames", "Gilded Dreams"),
+            weapons=("Wolf's Gravestone", "Serpent Spine", "Prototype Archaic"),
+            substats_priority=("CRIT Rate", "CRIT DMG", "ATK%", "Energy Recharge"),
+            talent_priority=("Elemental Skill", "Elemental Burst", "Normal Attack")
+        ),
+        Build(
+            character="Mavuika",
+            role="Support",
+            main_stats={"sands": "Energy Recharge", "goblet": "Pyro DMG%", "circlet": "CRIT Rate"},
+            artifact_sets=("Noblesse Oblige", "Emblem of Severed Fate"),
+            weapons=("Favonius Greatsword", "Sacrificial Greatsword"),
+            substats_priority=("Energy Recharge", "CRIT Rate", "ATK%", "CRIT DMG"),
+            talent_priority=("Elemental Burst", "Elemental Skill", "Normal Attack")
+        )
+    ),
+    "neuvillette": (
+        Build(
+            character="Neuvillette",
+            role="DPS",
+            main_stats={"sands": "HP%", "goblet": "Hydro DMG%", "circlet": "CRIT Rate/DMG"},
+            artifact_sets=("Heart of Depth", "Marechaussee Hunter"),
+            weapons=("Lost Prayer to the Sacred Winds", "The Widsith", "Prototype Amber"),
+            substats_priority=("CRIT Rate", "CRIT DMG", "HP%", "Energy Recharge"),
+            talent_priority=("Normal Attack", "Elemental Skill", "Elemental Burst")
+        ),  # one-element tuple
+    ),
+    "kazuha": (
+        Build(
+            character="Kazuha",
+            role="Support",
+            main_stats={"sands": "Energy Recharge/Elemental Mastery", "goblet": "Elemental Mastery", "circlet": "Elemental Mastery"},
+            artifact_sets=("Viridescent Venerer", "Instructor"),
+            weapons=("Freedom-Sworn", "Iron Sting", "Sacrificial Sword"),
+            substats_priority=("Elemental Mastery", "Energy Recharge", "ATK%", "CRIT Rate"),
+            talent_priority=("Elemental Burst", "Elemental Skill", "Normal Attack")
+        ),  # one-element tuple
+    )
+})
+
+_TEAM_COMPS: Mapping[str, Tuple[Dict[str, Any], ...]] = MappingProxyType({
+    "mavuika": (
+        {"name": "Vape Team", "members": ("Mavuika", "Xingqiu", "Bennett", "Kazuha")},
+        {"name": "Melt Team", "members": ("Mavuika", "Rosaria", "Kaeya", "Bennett")},
+        {"name": "Mono Pyro", "members": ("Mavuika", "Bennett", "Xiangling", "Kazuha")}
+    ),
+    "neuvillette": (
+        {"name": "Hydro Team", "members": ("Neuvillette", "Furina", "Kazuha", "Baizhu")},
+        {"name": "Hypercarry", "members": ("Neuvillette", "Zhongli", "Kazuha", "Bennett")}
+    ),
+    "kazuha": (
+        {"name": "National Team", "members": ("Kazuha", "Xiangling", "Xingqiu", "Bennett")},
+        {"name": "Freeze Team", "members": ("Kazuha", "Ayaka", "Mona", "Diona")}
+    )
+})
+
+# Every key is already lowercase, so callers can skip normalizing hits
+_CHAR_KEYS = frozenset(_CHARACTERS)
 
 class GenshinDatabase:
-    """Mock database with Genshin Impact character and build data"""
+    """Serialized resources for the module-level Genshin Impact data"""
     
     def __init__(self):
-        self.characters = {
-            "mavuika": Character(
-                name="Mavuika",
-                element="Pyro",
-                weapon_type="Claymore",
-                rarity=5,
-                role="DPS/Support",
-                description="The Pyro Archon with powerful elemental abilities"
-            ),
-            "neuvillette": Character(
-                name="Neuvillette",
-                element="Hydro",
-                weapon_type="Catalyst",
-                rarity=5,
-                role="DPS",
-                description="Hydro DPS with charge attack focus"
-            ),
-            "kazuha": Character(
-                name="Kazuha",
-                element="Anemo",
-                weapon_type="Sword",
-                rarity=5,
-                role="Support",
-                description="Anemo support with crowd control and elemental damage bonus"
-            ),
-            "nahida": Character(
-                name="Nahida",
-                element="Dendro",
-                weapon_type="Catalyst",
-                rarity=5,
-                role="Support/DPS",
-                description="Dendro Archon with reaction-based abilities"
-            ),
-            "furina": Character(
-                name="Furina",
-                element="Hydro",
-                weapon_type="Sword",
-                rarity=5,
-                role="Support",
-                description="Hydro support with summoning abilities"
-            )
-        }
-        
-        self.builds = {
-            "mavuika": [
-                Build(
-                    character="Mavuika",
-                    role="DPS",
-                    main_stats={"sands": "ATK%", "goblet": "Pyro DMG%", "circlet": "CRIT Rate/DMG"},
-                    artifact_sets=["Crimson Witch of Flames", "Gilded Dreams"],
-                    weapons=["Wolf's Gravestone", "Serpent Spine", "Prototype Archaic"],
-                    substats_priority=["CRIT Rate", "CRIT DMG", "ATK%", "Energy Recharge"],
-                    talent_priority=["Elemental Skill", "Elemental Burst", "Normal Attack"]
-                ),
-                Build(
-                    character="Mavuika",
-                    role="Support",
-                    main_stats={"sands": "Energy Recharge", "goblet": "Pyro DMG%", "circlet": "CRIT Rate"},
-                    artifact_sets=["Noblesse Oblige", "Emblem of Severed Fate"],
-                    weapons=["Favonius Greatsword", "Sacrificial Greatsword"],
-                    substats_priority=["Energy Recharge", "CRIT Rate", "ATK%", "CRIT DMG"],
-                    talent_priority=["Elemental Burst", "Elemental Skill", "Normal Attack"]
-                )
-            ],
-            "neuvillette": [
-                Build(
-                    character="Neuvillette",
-                    role="DPS",
-                    main_stats={"sands": "HP%", "goblet": "Hydro DMG%", "circlet": "CRIT Rate/DMG"},
-                    artifact_sets=["Heart of Depth", "Marechaussee Hunter"],
-                    weapons=["Lost Prayer to the Sacred Winds", "The Widsith", "Prototype Amber"],
-                    substats_priority=["CRIT Rate", "CRIT DMG", "HP%", "Energy Recharge"],
-                    talent_priority=["Normal Attack", "Elemental Skill", "Elemental Burst"]
-                )
-            ],
-            "kazuha": [
-                Build(
-                    character="Kazuha",
-                    role="Support",
-                    main_stats={"sands": "Energy Recharge/Elemental Mastery", "goblet": "Elemental Mastery", "circlet": "Elemental Mastery"},
-                    artifact_sets=["Viridescent Venerer", "Instructor"],
-                    weapons=["Freedom-Sworn", "Iron Sting", "Sacrificial Sword"],
-                    substats_priority=["Elemental Mastery", "Energy Recharge", "ATK%", "CRIT Rate"],
-                    talent_priority=["Elemental Burst", "Elemental Skill", "Normal Attack"]
-                )
-            ]
-        }
-        
-        self.team_comps = {
-            "mavuika": [
-                {"name": "Vape Team", "members": ["Mavuika", "Xingqiu", "Bennett", "Kazuha"]},
-                {"name": "Melt Team", "members": ["Mavuika", "Rosaria", "Kaeya", "Bennett"]},
-                {"name": "Mono Pyro", "members": ["Mavuika", "Bennett", "Xiangling", "Kazuha"]}
-            ],
-            "neuvillette": [
-                {"name": "Hydro Team", "members": ["Neuvillette", "Furina", "Kazuha", "Baizhu"]},
-                {"name": "Hypercarry", "members": ["Neuvillette", "Zhongli", "Kazuha", "Bennett"]}
-            ],
-            "kazuha": [
-                {"name": "National Team", "members": ["Kazuha", "Xiangling", "Xingqiu", "Bennett"]},
-                {"name": "Freeze Team", "members": ["Kazuha", "Ayaka", "Mona", "Diona"]}
-            ]
-        }
+        # The data never changes at runtime, so serialize each resource once
+        self._characters_json = _dumps({name: char.as_dict for name, char in _CHARACTERS.items()})
+        self._builds_json = _dumps({
+            char_name: [build.as_dict for build in builds]
+            for char_name, builds in _BUILDS.items()
+        })
+        self._teams_json = _dumps(dict(_TEAM_COMPS))
+
+@functools.cache
+def get_database() -> GenshinDatabase:
+    """Return the process-wide database; it is built on first use"""
+    database = GenshinDatabase()
+    _warm_tool_caches()
+    return database
+
+# Tool output depends only on the static data above, so each formatter is
+# memoized on its (normalized) arguments. Each returns None when the
+# character has no matching data.
+
+def _format_build(build: Build, heading: str, label: str) -> str:
+    """Render one build; label is a format string such as "- {}: " """
+    return "".join((
+        f"{heading}\n",
+        f"{label.format('Main Stats')}{build.main_stats}\n",
+        f"{label.format('Artifact Sets')}{build.artifact_sets_str}\n",
+        f"{label.format('Weapons')}{build.weapons_str}\n",
+        f"{label.format('Substat Priority')}{build.substats_str}\n",
+        f"{label.format('Talent Priority')}{build.talent_str}\n\n"
+    ))
+
+@functools.lru_cache(maxsize=128)
+def _cached_info(char_name: str) -> Optional[str]:
+    if char_name not in _CHARACTERS:
+        return None
+    char = _CHARACTERS[char_name]
+    return f"""
+**{char.name}**
+- Element: {char.element}
+- Weapon Type: {char.weapon_type}
+- Rarity: {char.rarity}★
+- Role: {char.role}
+- Description: {char.description}
+"""
+
+@functools.lru_cache(maxsize=128)
+def _cached_builds(char_name: str, role_filter: Optional[str]) -> Optional[str]:
+    if char_name not in _BUILDS:
+        return None
+    builds = _BUILDS[char_name]
+    if role_filter:
+        builds = [b for b in builds if b.role.lower() == role_filter.lower()]
+    
+    parts: list[str] = [f"**Build Guide for {char_name.title()}**\n\n"]
+    for build in builds:
+        parts.append(_format_build(build, f"**{build.role} Build:**", "- {}: "))
+    return "".join(parts)
+
+@functools.lru_cache(maxsize=128)
+def _cached_teams(char_name: str) -> Optional[str]:
+    if char_name not in _TEAM_COMPS:
+        return None
+    parts: list[str] = [f"**Team Compositions for {char_name.title()}**\n\n"]
+    for team in _TEAM_COMPS[char_name]:
+        parts.extend((
+            f"**{team['name']}:**\n",
+            f"- {' | '.join(team['members'])}\n\n"
+        ))
+    return "".join(parts)
+
+@functools.lru_cache(maxsize=128)
+def _cached_guide(char_name: str, include_teams: bool) -> Optional[str]:
+    if char_name not in _CHARACTERS:
+        return None
+    
+    char = _CHARACTERS[char_name]
+    parts: list[str] = [
+        f"# Complete Build Guide for {char.name}\n\n",
+        "**Character Overview:**\n",
+        f"- Element: {char.element}\n",
+        f"- Weapon: {char.weapon_type}\n",
+        f"- Rarity: {char.rarity}★\n",
+        f"- Role: {char.role}\n",
+        f"- Description: {char.description}\n\n"
+    ]
+    
+    # Add builds
+    if char_name in _BUILDS:
+        parts.append("## Recommended Builds\n\n")
+        for build in _BUILDS[char_name]:
+            parts.append(_format_build(build, f"### {build.role} Build", "**{}:** "))
+    
+    # Add team compositions
+    if include_teams and char_name in _TEAM_COMPS:
+        parts.append("## Team Compositions\n\n")
+        for team in _TEAM_COMPS[char_name]:
+            parts.append(f"**{team['name']}:** {' | '.join(team['members'])}\n")
+    
+    return "".join(parts)
+
+def _warm_tool_caches():
+    """Render every character's tool output up front so calls are cache hits"""
+    for char_name in _CHARACTERS:
+        _cached_info(char_name)
+        _cached_teams(char_name)
+        for include_teams in (True, False):
+            _cached_guide(char_name, include_teams)
+    for char_name, builds in _BUILDS.items():
+        _cached_builds(char_name, None)
+        # Warm the role spellings used by the tool schema's enum
+        for role in {build.role for build in builds}:
+            _cached_builds(char_name, role)
 
 class GenshinMCPServer:
     def __init__(self):
         self.server = Server("genshin-impact-guide")
-        self.db = GenshinDatabase()
+        self.db = get_database()
         self.setup_handlers()
     
     def setup_handlers(self):
+        # Descriptors never change, so build them once instead of per list call
+        self._resources_list = [
+            types.Resource(
+                uri="genshin://characters",
+                name="Genshin Impact Characters",
+                description="Database of Genshin Impact characters with stats and information",
+                mimeType="application/json"
+            ),
+            types.Resource(
+                uri="genshin://builds",
+                name="Character Builds",
+                description="Optimal builds and artifacts for characters",
+                mimeType="application/json"
+            ),
+            types.Resource(
+                uri="genshin://teams",
+                name="Team Compositions",
+                description="Recommended team compositions for different characters",
+                mimeType="application/json"
+            )
+        ]
+        
+        self._tools_list = [
+            types.Tool(
+                name="get_character_info",
+                description="Get detailed information about a specific character",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "character_name": {
+                            "type": "string",
+                            "description": "Name of the character (e.g., 'mavuika', 'neuvillette')"
+                        }
+                    },
+                    "required": ["character_name"]
+                }
+            ),
+            types.Tool(
+                name="get_character_builds",
+                description="Get optimal builds for a character",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "character_name": {
+                            "type": "string",
+                            "description": "Name of the character"
+                        },
+                        "role": {
+                            "type": "string",
+                            "description": "Specific role (DPS, Support, etc.) - optional",
+                            "enum": ["DPS", "Support", "Sub-DPS", "Healer"]
+                        }
+                    },
+                    "required": ["character_name"]
+                }
+            ),
+            types.Tool(
+                name="get_team_compositions",
+                description="Get recommended team compositions for a character",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "character_name": {
+                            "type": "string",
+                            "description": "Name of the character"
+                        }
+                    },
+                    "required": ["character_name"]
+                }
+            ),
+            types.Tool(
+                name="create_build_guide",
+                description="Create a comprehensive build guide for a character",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "character_name": {
+                            "type": "string",
+                            "description": "Name of the character"
+                        },
+                        "include_teams": {
+                            "type": "boolean",
+                            "description": "Include team composition recommendations",
+                            "default": True
+                        }
+                    },
+                    "required": ["character_name"]
+                }
+            )
+        ]
+        
         @self.server.list_resources()
         async def handle_list_resources() -> list[types.Resource]:
             """List available Genshin Impact resources"""
-            return [
-                types.Resource(
-                    uri="genshin://characters",
-                    name="Genshin Impact Characters",
-                    description="Database of Genshin Impact characters with stats and information",
-                    mimeType="application/json"
-                ),
-                types.Resource(
-                    uri="genshin://builds",
-                    name="Character Builds",
-                    description="Optimal builds and artifacts for characters",
-                    mimeType="application/json"
-                ),
-                types.Resource(
-                    uri="genshin://teams",
-                    name="Team Compositions",
-                    description="Recommended team compositions for different characters",
-                    mimeType="application/json"
-                )
-            ]
+            return self._resources_list
+        
+        resource_cache = {
+            "genshin://characters": self.db._characters_json,
+            "genshin://builds": self.db._builds_json,
+            "genshin://teams": self.db._teams_json
+        }
         
         @self.server.read_resource()
-        async def handle_read_resource(uri: str) -> str:
+        async def handle_read_resource(uri: AnyUrl) -> str:
             """Read specific Genshin Impact resource"""
-            if uri == "genshin://characters":
-                return json.dumps({
-                    name: {
-                        "name": char.name,
-                        "element": char.element,
-                        "weapon_type": char.weapon_type,
-                        "rarity": char.rarity,
-                        "role": char.role,
-                        "description": char.description
-                    }
-                    for name, char in self.db.characters.items()
-                }, indent=2)
-            
-            elif uri == "genshin://builds":
-                builds_data = {}
-                for char_name, builds in self.db.builds.items():
-                    builds_data[char_name] = []
-                    for build in builds:
-                        builds_data[char_name].append({
-                            "role": build.role,
-                            "main_stats": build.main_stats,
-                            "artifact_sets": build.artifact_sets,
-                            "weapons": build.weapons,
-                            "substats_priority": build.substats_priority,
-                            "talent_priority": build.talent_priority
-                        })
-                return json.dumps(builds_data, indent=2)
-            
-            elif uri == "genshin://teams":
-                return json.dumps(self.db.team_comps, indent=2)
-            
-            else:
-                raise ValueError(f"Unknown resource: {uri}")
+            # The SDK passes a pydantic AnyUrl, which never equals a plain str
+            try:
+                return resource_cache[str(uri)]
+            except KeyError:
+                raise ValueError(f"Unknown resource: {uri}") from None
         
         @self.server.list_tools()
         async def handle_list_tools() -> list[types.Tool]:
             """List available tools for Genshin Impact queries"""
-            return [
-                types.Tool(
-                    name="get_character_info",
-                    description="Get detailed information about a specific character",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "character_name": {
-                                "type": "string",
-                                "description": "Name of the character (e.g., 'mavuika', 'neuvillette')"
-                            }
-                        },
-                        "required": ["character_name"]
-                    }
-                ),
-                types.Tool(
-                    name="get_character_builds",
-                    description="Get optimal builds for a character",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "character_name": {
-                                "type": "string",
-                                "description": "Name of the character"
-                            },
-                            "role": {
-                                "type": "string",
-                                "description": "Specific role (DPS, Support, etc.) - optional",
-                                "enum": ["DPS", "Support", "Sub-DPS", "Healer"]
-                            }
-                        },
-                        "required": ["character_name"]
-                    }
-                ),
-                types.Tool(
-                    name="get_team_compositions",
-                    description="Get recommended team compositions for a character",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "character_name": {
-                                "type": "string",
-                                "description": "Name of the character"
-                            }
-                        },
-                        "required": ["character_name"]
-                    }
-                ),
-                types.Tool(
-                    name="create_build_guide",
-                    description="Create a comprehensive build guide for a character",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "character_name": {
-                                "type": "string",
-                                "description": "Name of the character"
-                            },
-                            "include_teams": {
-                                "type": "boolean",
-                                "description": "Include team composition recommendations",
-                                "default": True
-                            }
-                        },
-                        "required": ["character_name"]
-                    }
-                )
-            ]
+            return self._tools_list
+        
+        def _normalize(char_name: str) -> str:
+            # Most callers already pass the lowercase key; only lower() on a miss
+            if char_name not in _CHAR_KEYS:
+                char_name = char_name.lower()
+            return char_name
+        
+        def _info(arguments: dict) -> list[types.TextContent]:
+            char_name = _normalize(arguments["character_name"])
+            text = _cached_info(char_name)
+            if text is None:
+                text = f"Character '{arguments['character_name']}' not found in database."
+            return [types.TextContent(type="text", text=text)]
+        
+        def _builds(arguments: dict) -> list[types.TextContent]:
+            char_name = _normalize(arguments["character_name"])
+            role_filter = arguments.get("role")
+            text = _cached_builds(char_name, role_filter)
+            if text is None:
+                text = f"No builds found for '{arguments['character_name']}'."
+            return [types.TextContent(type="text", text=text)]
+        
+        def _teams(arguments: dict) -> list[types.TextContent]:
+            char_name = _normalize(arguments["character_name"])
+            text = _cached_teams(char_name)
+            if text is None:
+                text = f"No team compositions found for '{arguments['character_name']}'."
+            return [types.TextContent(type="text", text=text)]
+        
+        def _guide(arguments: dict) -> list[types.TextContent]:
+            char_name = _normalize(arguments["character_name"])
+            include_teams = bool(arguments.get("include_teams", True))
+            text = _cached_guide(char_name, include_teams)
+            if text is None:
+                text = f"Character '{arguments['character_name']}' not found."
+            return [types.TextContent(type="text", text=text)]
+        
+        self._tools = {
+            "get_character_info": _info,
+            "get_character_builds": _builds,
+            "get_team_compositions": _teams,
+            "create_build_guide": _guide
+        }
         
         @self.server.call_tool()
         async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent]:
             """Handle tool calls for Genshin Impact queries"""
-            
-            if name == "get_character_info":
-                char_name = arguments["character_name"].lower()
-                if char_name in self.db.characters:
-                    char = self.db.characters[char_name]
-                    info = f"""
-**{char.name}**
-- Element: {char.element}
-- Weapon Type: {char.weapon_type}
-- Rarity: {char.rarity}★
-- Role: {char.role}
-- Description: {char.description}
-"""
-                    return [types.TextContent(type="text", text=info)]
-                else:
-                    return [types.TextContent(type="text", text=f"Character '{arguments['character_name']}' not found in database.")]
-            
-            elif name == "get_character_builds":
-                char_name = arguments["character_name"].lower()
-                role_filter = arguments.get("role")
-                
-                if char_name in self.db.builds:
-                    builds = self.db.builds[char_name]
-                    if role_filter:
-                        builds = [b for b in builds if b.role.lower() == role_filter.lower()]
-                    
-                    result = f"**Build Guide for {char_name.title()}**\n\n"
-                    for build in builds:
-                        result += f"**{build.role} Build:**\n"
-                        result += f"- Main Stats: {build.main_stats}\n"
-                        result += f"- Artifact Sets: {', '.join(build.artifact_sets)}\n"
-                        result += f"- Weapons: {', '.join(build.weapons)}\n"
-                        result += f"- Substat Priority: {' > '.join(build.substats_priority)}\n"
-                        result += f"- Talent Priority: {' > '.join(build.talent_priority)}\n\n"
-                    
-                    return [types.TextContent(type="text", text=result)]
-                else:
-                    return [types.TextContent(type="text", text=f"No builds found for '{arguments['character_name']}'.")]
-            
-            elif name == "get_team_compositions":
-                char_name = arguments["character_name"].lower()
-                if char_name in self.db.team_comps:
-                    teams = self.db.team_comps[char_name]
-                    result = f"**Team Compositions for {char_name.title()}**\n\n"
-                    for team in teams:
-                        result += f"**{team['name']}:**\n"
-                        result += f"- {' | '.join(team['members'])}\n\n"
-                    return [types.TextContent(type="text", text=result)]
-                else:
-                    return [types.TextContent(type="text", text=f"No team compositions found for '{arguments['character_name']}'.")]
-            
-            elif name == "create_build_guide":
-                char_name = arguments["character_name"].lower()
-                include_teams = arguments.get("include_teams", True)
-                
-                if char_name not in self.db.characters:
-                    return [types.TextContent(type="text", text=f"Character '{arguments['character_name']}' not found.")]
-                
-                char = self.db.characters[char_name]
-                result = f"# Complete Build Guide for {char.name}\n\n"
-                result += f"**Character Overview:**\n"
-                result += f"- Element: {char.element}\n"
-                result += f"- Weapon: {char.weapon_type}\n"
-                result += f"- Rarity: {char.rarity}★\n"
-                result += f"- Role: {char.role}\n"
-                result += f"- Description: {char.description}\n\n"
-                
-                # Add builds
-                if char_name in self.db.builds:
-                    result += "## Recommended Builds\n\n"
-                    for build in self.db.builds[char_name]:
-                        result += f"### {build.role} Build\n"
-                        result += f"**Main Stats:** {build.main_stats}\n"
-                        result += f"**Artifact Sets:** {', '.join(build.artifact_sets)}\n"
-                        result += f"**Weapons:** {', '.join(build.weapons)}\n"
-                        result += f"**Substat Priority:** {' > '.join(build.substats_priority)}\n"
-                        result += f"**Talent Priority:** {' > '.join(build.talent_priority)}\n\n"
-                
-                # Add team compositions
-                if include_teams and char_name in self.db.team_comps:
-                    result += "## Team Compositions\n\n"
-                    for team in self.db.team_comps[char_name]:
-                        result += f"**{team['name']}:** {' | '.join(team['members'])}\n"
-                
-                return [types.TextContent(type="text", text=result)]
-            
-            else:
+            handler = self._tools.get(name)
+            if handler is None:
                 return [types.TextContent(type="text", text=f"Unknown tool: {name}")]
+            return handler(arguments)
 
 async def main():
     server = GenshinMCPServer()
@@ -391,13 +487,13 @@ async def main():
                 server_name="genshin-impact-guide",
                 server_version="1.0.0",
                 capabilities=server.server.get_capabilities(
-                    notification_options=None,
-                    experimental_capabilities=None
+                    notification_options=NotificationOptions(),
+                    experimental_capabilities={}
                 )
             )
         )
 
 if __name__ == "__main__":
     # Install required packages:
-    # pip install mcp httpx
-    asyncio.run(main())
+    # pip install mcp
+    run_event_loop(main())